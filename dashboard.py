@@ -2,8 +2,10 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.colors import to_rgba
 from matplotlib.gridspec import GridSpec
-from esg_standards import ESG_METRICS
+from matplotlib.table import Table
+from esg_standards import CATEGORIES, METRICS_BY_CATEGORY, METRICS_SORTED
 
 
 class Dashboard:
@@ -23,26 +25,64 @@ class Dashboard:
         "blue": "#2980b9", "dark": "#2c3e50", "bg": "#f8f9fa",
     }
 
+    # shared panel styling, applied once around the whole render
+    RC = {
+        "axes.spines.top": False, "axes.spines.right": False,
+        "axes.titlesize": 14, "axes.titleweight": "bold", "axes.titlepad": 12,
+        "axes.labelsize": 11, "legend.fontsize": 10,
+    }
+
     def __init__(self, df, scores, company="Sample Corp"):
         self.df = df
         self.scores = scores
         self.company = company
+        # figure and axes are created on first render and reused afterwards
+        self._fig = None
+        self._axes = None
 
-    def render(self, save_path=None):
+    def _build_figure(self):
         fig = plt.figure(figsize=(20, 24), facecolor=self.C["bg"])
         gs = GridSpec(3, 2, figure=fig, hspace=0.32, wspace=0.28,
                       top=0.93, bottom=0.03, left=0.07, right=0.96)
+        axes = [
+            fig.add_subplot(gs[0, 0]),
+            fig.add_subplot(gs[0, 1], polar=True),
+            fig.add_subplot(gs[1, :]),
+            fig.add_subplot(gs[2, 0]),
+            fig.add_subplot(gs[2, 1]),
+        ]
+        return fig, axes
+
+    def render(self, save_path=None):
+        with plt.rc_context(self.RC):
+            return self._render(save_path)
+
+    def _render(self, save_path):
+        # per-render lookups shared by the panels below
+        self._by_id = (self.df.drop_duplicates("metric_id").set_index("metric_id")
+                       if len(self.df) else pd.DataFrame())
+        self._found_ids = frozenset(self._by_id.index)
+
+        # rebuild once pyplot has closed the figure (inline backend after
+        # each cell, a closed GUI window, plt.close)
+        if self._fig is None or not plt.fignum_exists(self._fig.number):
+            self._fig, self._axes = self._build_figure()
+        else:
+            for ax in self._axes:
+                ax.cla()
+        fig = self._fig
 
         fig.suptitle(
             f"ESG Data Extraction & Quality Dashboard — {self.company}",
             fontsize=22, fontweight="bold", color=self.C["dark"], y=0.97,
         )
 
-        self._category_bars(fig.add_subplot(gs[0, 0]))
-        self._radar(fig.add_subplot(gs[0, 1], polar=True))
-        self._completeness_grid(fig.add_subplot(gs[1, :]))
-        self._confidence_hist(fig.add_subplot(gs[2, 0]))
-        self._check_bars(fig.add_subplot(gs[2, 1]))
+        ax_cat, ax_radar, ax_grid, ax_conf, ax_chk = self._axes
+        self._category_bars(ax_cat)
+        self._radar(ax_radar)
+        self._completeness_grid(ax_grid)
+        self._confidence_hist(ax_conf)
+        self._check_bars(ax_chk)
 
         # 
 
@@ -55,11 +95,11 @@ class Dashboard:
 
     # (A) Category-wise extraction bars
     def _category_bars(self, ax):
-        cats = ["Environmental", "Social", "Governance"]
-        found_ids = set(self.df["metric_id"].unique()) if len(self.df) else set()
+        cats = list(CATEGORIES)
+        found_ids = self._found_ids
         ext, mis = [], []
         for cat in cats:
-            tgt = {m["id"] for m in ESG_METRICS if m["category"] == cat}
+            tgt = METRICS_BY_CATEGORY[cat]
             ext.append(len(found_ids & tgt))
             mis.append(len(tgt) - len(found_ids & tgt))
 
@@ -79,12 +119,10 @@ class Dashboard:
 
         ax.set_xticks(x)
         ax.set_xticklabels(cats, fontsize=11)
-        ax.set_ylabel("Metrics", fontsize=11)
-        ax.set_title("Extraction Coverage by Category",
-                      fontsize=14, fontweight="bold", pad=12)
-        ax.legend(fontsize=10)
+        ax.set_ylabel("Metrics")
+        ax.set_title("Extraction Coverage by Category")
+        ax.legend()
         ax.set_ylim(0, max(e + m for e, m in zip(ext, mis)) * 1.25 + 0.5)
-        ax.spines[["top", "right"]].set_visible(False)
 
     # (B) Quality radar chart
     def _radar(self, ax):
@@ -104,8 +142,7 @@ class Dashboard:
         ax.set_yticks([.2, .4, .6, .8, 1.0])
         ax.set_yticklabels(["20%", "40%", "60%", "80%", "100%"],
                            fontsize=7, color="#95a5a6")
-        ax.set_title("Data Quality Dimensions",
-                      fontsize=14, fontweight="bold", pad=24)
+        ax.set_title("Data Quality Dimensions", pad=24)
 
         for a, v in zip(angles, vals):
             ax.annotate(f"{v:.0%}", xy=(a, v), fontsize=10,
@@ -115,48 +152,44 @@ class Dashboard:
 
     # (C) Metric-level completeness grid
     def _completeness_grid(self, ax):
-        cat_order = ["Environmental", "Social", "Governance"]
-        sorted_m = sorted(ESG_METRICS,
-                          key=lambda m: cat_order.index(m["category"]))
-        found = set(self.df["metric_id"].unique()) if len(self.df) else set()
-
-        labels, statuses = [], []
-        for m in sorted_m:
-            labels.append(f"{m['id']}  {m['name_en']}")
-            if m["id"] not in found:
-                statuses.append(0.0)
-            else:
-                row = self.df[self.df["metric_id"] == m["id"]].iloc[0]
-                statuses.append(1.0 if row["validation_score"] >= 0.8 else 0.5)
+        sorted_m = METRICS_SORTED
+        by_id = self._by_id
+        found = self._found_ids
+
+        score = by_id.get("validation_score", pd.Series(dtype=float))
+        score = score.reindex([m["id"] for m in sorted_m]).to_numpy(dtype=float)
+        statuses = np.select([np.isnan(score), score >= 0.8], [0.0, 1.0], 0.5)
 
         color_map = {1.0: self.C["green"],
                      0.5: self.C["yellow"],
                      0.0: self.C["red"]}
         status_txt = {1.0: "✓ Valid", 0.5: "⚠ Review", 0.0: "✗ Missing"}
-        y = np.arange(len(labels))
-
-        ax.barh(y, [1] * len(labels),
-                color=[color_map[s] for s in statuses],
-                alpha=0.82, edgecolor="white", linewidth=2.5, height=0.72)
-
-        for i, (lbl, s) in enumerate(zip(labels, statuses)):
-            ax.text(0.015, i, lbl, va="center", fontsize=9.5,
-                    color="white", fontweight="bold")
-            ax.text(0.985, i, status_txt[s], va="center", ha="right",
-                    fontsize=9.5, color="white", fontweight="bold")
 
-            mid = sorted_m[i]["id"]
-            if mid in found:
-                row = self.df[self.df["metric_id"] == mid].iloc[0]
+        # one Table artist (label | value | status per row) instead of a
+        # barh plus three Text artists per metric
+        table = Table(ax, bbox=[0, 0, 1, 1])
+        widths, locs = (0.45, 0.30, 0.25), ("left", "center", "right")
+        h = 1 / len(sorted_m)
+        for i, (m, s) in enumerate(zip(sorted_m, statuses)):
+            val_str = ""
+            if m["id"] in found:
+                row = by_id.loc[m["id"]]
                 val_str = f'{row["value"]:,.1f} {row["unit"]}'
-                ax.text(0.55, i, val_str, va="center", ha="center",
-                        fontsize=9, color="white", fontstyle="italic")
+            texts = (f"{m['id']}  {m['name_en']}", val_str, status_txt[s])
+            for j, (txt, w, loc) in enumerate(zip(texts, widths, locs)):
+                cell = table.add_cell(i, j, w, h, text=txt, loc=loc,
+                                      facecolor=to_rgba(color_map[s], 0.82),
+                                      edgecolor="white")
+                cell.set_linewidth(2.5)
+                cell.PAD = 0.03
+                cell.get_text().set(color="white", fontsize=9 if j == 1 else 9.5,
+                                    fontweight="normal" if j == 1 else "bold",
+                                    fontstyle="italic" if j == 1 else "normal")
+        table.auto_set_font_size(False)
+        ax.add_table(table)
 
-        ax.set_xlim(0, 1); ax.set_ylim(-0.5, len(labels) - 0.5)
         ax.set_yticks([]); ax.set_xticks([])
-        ax.invert_yaxis()
-        ax.set_title("Metric-Level Completeness & Validation",
-                      fontsize=14, fontweight="bold", pad=12)
+        ax.set_title("Metric-Level Completeness & Validation")
         ax.spines[:].set_visible(False)
 
         legend_items = [
@@ -171,7 +204,7 @@ class Dashboard:
         if self.df.empty:
             ax.text(.5, .5, "No data", ha="center", transform=ax.transAxes)
             return
-        conf = self.df["confidence"].dropna()
+        conf = self.df["confidence"].dropna().to_numpy(dtype=np.float64)
         bins = np.arange(0, 1.1, 0.1)
         n, b, patches = ax.hist(conf, bins=bins, edgecolor="white", lw=1.5)
         for patch, left in zip(patches, b[:-1]):
@@ -180,15 +213,13 @@ class Dashboard:
             else:             patch.set_facecolor(self.C["red"])
             patch.set_alpha(0.82)
 
-        mu = conf.mean()
+        mu = float(conf.mean())
         ax.axvline(mu, color=self.C["dark"], ls="--", lw=2,
                    label=f"Mean: {mu:.2f}")
-        ax.set_xlabel("Confidence", fontsize=11)
-        ax.set_ylabel("Count", fontsize=11)
-        ax.set_title("LLM Confidence Distribution",
-                      fontsize=14, fontweight="bold", pad=12)
-        ax.legend(fontsize=10)
-        ax.spines[["top", "right"]].set_visible(False)
+        ax.set_xlabel("Confidence")
+        ax.set_ylabel("Count")
+        ax.set_title("LLM Confidence Distribution")
+        ax.legend()
 
     # (E) Validation check pass rates
     def _check_bars(self, ax):
@@ -197,7 +228,7 @@ class Dashboard:
             return
         cols = [c for c in self.df.columns if c.startswith("chk_")]
         names = [c.replace("chk_", "").replace("_", " ").title() for c in cols]
-        passes = [self.df[c].mean() for c in cols]
+        passes = self.df[cols].mean().tolist()
         y = np.arange(len(names))
 
         ax.barh(y, passes, color=self.C["green"], alpha=.82,
@@ -213,8 +244,6 @@ class Dashboard:
         ax.set_yticks(y)
         ax.set_yticklabels(names, fontsize=10)
         ax.set_xlim(0, 1)
-        ax.set_title("Validation Check Pass Rates",
-                      fontsize=14, fontweight="bold", pad=12)
-        ax.legend(loc="lower right", fontsize=10)
-        ax.spines[["top", "right"]].set_visible(False)
+        ax.set_title("Validation Check Pass Rates")
+        ax.legend(loc="lower right")
         ax.invert_yaxis()
\ No newline at end of file
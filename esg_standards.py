@@ -53,3 +53,17 @@ ESG_METRICS = [
      "name_kr": "반부패 교육 이수율", "unit": "%", "gri": "GRI 205-2",
      "valid_range": (0, 100)},
 ]
+
+# LOOKUP TABLES (built once at import)
+
+CATEGORIES = ("Environmental", "Social", "Governance")
+
+METRICS_BY_ID = {m["id"]: m for m in ESG_METRICS}
+
+METRICS_BY_CATEGORY = {
+    cat: frozenset(m["id"] for m in ESG_METRICS if m["category"] == cat)
+    for cat in CATEGORIES
+}
+
+METRICS_SORTED = sorted(ESG_METRICS,
+                        key=lambda m: CATEGORIES.index(m["category"]))
@@ -1,3 +1,18 @@
-from .ollama_extractor import ESGExtractorOllama
-from .openai_extractor import ESGExtractor
-from .init_extractor import create_extractor
\ No newline at end of file
+from importlib import import_module
+
+from .init_extractor import create_extractor
+
+# Backend classes are imported on first access, so picking one backend
+# doesn't import the other's client library (requests / openai).
+_BACKENDS = {
+    "ESGExtractorOllama": ".ollama_extractor",
+    "ESGExtractor": ".openai_extractor",
+}
+
+
+def __getattr__(name):
+    if name in _BACKENDS:
+        cls = getattr(import_module(_BACKENDS[name], __name__), name)
+        globals()[name] = cls  # later lookups skip __getattr__
+        return cls
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
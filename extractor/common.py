@@ -0,0 +1,44 @@
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+import json
+from esg_standards import ESG_METRICS
+from typing import List, Dict
+
+# Target-metric list shared by every backend's prompt — built once at import
+METRICS_BLOCK = "\n".join(
+    f"  - {m['id']}: {m['name_kr']} ({m['name_en']}) | "
+    f"Unit: {m['unit']} | GRI: {m['gri']}"
+    for m in ESG_METRICS
+)
+
+MIN_PAGE_CHARS = 100  # shorter pages (blank, image-only, dividers) are skipped
+
+# orjson is several times faster on multi-KB responses; both accept str/bytes
+loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def page_prompt(prefix: str, text: str, page_num: int) -> str:
+    """
+    Per-page prompt. Everything before the page text is identical across
+    requests, so the server can reuse its prompt (KV) cache for the prefix;
+    page-specific parts go last.
+    """
+    return f"{prefix}\n\n[텍스트] ({page_num}페이지)\n{text}"
+
+
+def has_candidates(text: str) -> bool:
+    """ESG values are numeric: a page without digits can't hold one"""
+    return (len(text.strip()) >= MIN_PAGE_CHARS
+            and any(ch.isdigit() for ch in text))
+
+
+def candidate_pages(pages: List[Dict]) -> List[Dict]:
+    """Pages worth sending to a model; reports how many were skipped"""
+    kept = [p for p in pages if has_candidates(p["combined"])]
+    if len(kept) < len(pages):
+        print(f"    {len(pages) - len(kept)} pages skipped (too short or no numbers)")
+    return kept
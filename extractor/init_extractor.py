@@ -1,13 +1,35 @@
-from . import ESGExtractorOllama, ESGExtractor
+import os
+
 
 def create_extractor(backend: str = "ollama", **kwargs):
     """
     Choose LLM backend for extraction.
     Default is Ollama with Qwen2.5-14B.
+    For Ollama, `quant` picks a quantized tag of the model, e.g.
+    quant="q5_K_M" → qwen2.5:14b-instruct-q5_K_M (the model must carry a
+    name:size tag; "-instruct" is added unless already there). The plain
+    qwen2.5:14b tag is already the 4-bit q4_K_M build.
+    check_model=False (or setting ESG_SKIP_MODEL_CHECK) skips the
+    /api/tags availability check.
     """
     if backend == "ollama":
+        from .ollama_extractor import ESGExtractorOllama
+        model = kwargs.get("model", "qwen2.5:14b")
+        quant = kwargs.get("quant")
+        if quant:
+            # quantized builds exist only as name:size-instruct-<quant> tags
+            name, sep, tag = model.partition(":")
+            if not sep or not tag:
+                raise ValueError(f"quant needs a name:size model tag, got {model!r}")
+            if not tag.endswith("-instruct"):
+                tag += "-instruct"
+            model = f"{name}:{tag}-{quant}"
         return ESGExtractorOllama(
-            model=kwargs.get("model", "qwen2.5:14b")
+            model=model,
+            max_workers=kwargs.get("max_workers"),
+            batch_size=kwargs.get("batch_size", 1),
+            check_model=kwargs.get("check_model",
+                                   os.getenv("ESG_SKIP_MODEL_CHECK") is None),
         )
     # elif backend == "hf":
     #     return ESGExtractorHF(
@@ -20,7 +42,11 @@ def create_extractor(backend: str = "ollama", **kwargs):
     #         api_key=kwargs.get("api_key", ""),
     #     )
     elif backend == "openai":
-        return ESGExtractor(api_key=kwargs.get("api_key", ""))
+        from .openai_extractor import ESGExtractor
+        return ESGExtractor(
+            api_key=kwargs.get("api_key", ""),
+            max_workers=kwargs.get("max_workers"),
+        )
     else:
         raise ValueError(f"Unknown backend: {backend}")
 
@@ -1,22 +1,128 @@
 from esg_standards import ESG_METRICS
+from .common import METRICS_BLOCK, candidate_pages, loads, page_prompt
+import functools
+import hashlib
 import json
-from typing import List, Dict
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+
+_JSON_DECODER = json.JSONDecoder()
+
+# One-page prompt preamble; the page itself is appended by page_prompt
+_PROMPT_PREFIX = """당신은 한국 기업 ESG 공시 보고서 데이터 추출 전문가입니다.
+
+아래 [텍스트]는 지속가능경영보고서의 한 페이지입니다.
+다음 지표의 값을 찾아 JSON으로 반환하세요.
+
+[대상 지표]
+{metrics}
+
+[규칙]
+1. 해당 지표가 텍스트에 없으면 건너뛰세요.
+2. 숫자의 쉼표를 제거하고 순수 숫자만 반환하세요.
+3. 반드시 아래 JSON 형식으로만 응답하세요. 다른 텍스트는 절대 포함하지 마세요.
+
+[형식]
+{{"extracted": [
+  {{"metric_id": "E01", "value": 12345.6, "unit": "tCO2eq",
+    "year": 2023, "confidence": <당신이 생각하는 0~1 사이의 신뢰도 점수>,
+    "source_text": "원문에서 발췌한 근거 문장"}}
+]}}
+
+어떤 지표도 없으면 {{"extracted": []}}""".format(metrics=METRICS_BLOCK)
+
+# Several pages per request: one shared preamble, one answer block per page
+_BATCH_PROMPT_PREFIX = """당신은 한국 기업 ESG 공시 보고서 데이터 추출 전문가입니다.
+
+아래는 지속가능경영보고서 여러 페이지의 텍스트입니다. 각 페이지는 [PAGE k] 로 구분됩니다.
+페이지별로 다음 지표의 값을 찾아 JSON으로 반환하세요.
+
+[대상 지표]
+{metrics}
+
+[규칙]
+1. 해당 지표가 텍스트에 없으면 건너뛰세요.
+2. 숫자의 쉼표를 제거하고 순수 숫자만 반환하세요.
+3. 반드시 아래 JSON 형식으로만 응답하세요. 다른 텍스트는 절대 포함하지 마세요.
+4. 각 [PAGE k] 마다 page_index 가 k 인 항목을 하나씩 반환하세요.
+
+[형식]
+{{"batched": [
+  {{"page_index": 0, "extracted": [
+    {{"metric_id": "E01", "value": 12345.6, "unit": "tCO2eq",
+      "year": 2023, "confidence": <당신이 생각하는 0~1 사이의 신뢰도 점수>,
+      "source_text": "원문에서 발췌한 근거 문장"}}
+  ]}}
+]}}
+
+지표가 없는 페이지는 {{"page_index": k, "extracted": []}}""".format(metrics=METRICS_BLOCK)
+
+
+def _server_parallelism(default: int = 4) -> int:
+    """
+    OLLAMA_NUM_PARALLEL as a worker count. Unset, invalid or 0 (which
+    Ollama treats as auto-select) all fall back to `default`.
+    """
+    try:
+        n = int(os.getenv("OLLAMA_NUM_PARALLEL", ""))
+    except ValueError:
+        return default
+    return n if n > 0 else default
+
+
+@functools.lru_cache(maxsize=8)
+def _list_ollama_models(base_url: str) -> Tuple[str, ...]:
+    """Model tags served at base_url; fetched once per process"""
+    r = requests.get(f"{base_url}/api/tags", timeout=5)
+    return tuple(m["name"] for m in r.json().get("models", []))
 
 
 class ESGExtractorOllama:
     """Ollama-based extractor for local LLMs — qwen, llama3, etc."""
 
+    MAX_PAGE_CHARS = 3000  # page text sent to the model per prompt
+    # chunks read past the closing brace while waiting for `done`
+    TRAILING_CHUNKS = 8
+
     def __init__(self, model: str = "qwen2.5:14b",
-                 base_url: str = "http://localhost:11434"):
+                 base_url: str = "http://localhost:11434",
+                 max_workers: Optional[int] = None,
+                 batch_size: int = 1,
+                 check_model: bool = True):
         self.model = model
         self.base_url = base_url
+        # pages packed into one request; 1 keeps the per-page prompt.
+        # Larger batches need a model/context window that fits B pages.
+        self.batch_size = max(1, batch_size)
+        # one context size for every request of the run (single-page
+        # fallbacks included): Ollama reloads the model when num_ctx changes
+        self.num_ctx = 4096 * self.batch_size if self.batch_size > 1 else None
+        # match the server's parallelism so requests don't just queue there
+        self.max_workers = max(1, max_workers or _server_parallelism())
+
+        # one keep-alive connection per worker, reused across pages as long
+        # as each streamed reply is read to the end (see _call_ollama)
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=self.max_workers))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=self.max_workers))
+
+        # generation budget per page: ~70 tokens per metric entry + slack
+        self.max_new = min(2048, 64 + 70 * len(ESG_METRICS))
 
         # Check connection and model availability
+        if check_model:
+            self._check_model(model, base_url)
+
+    def _check_model(self, model: str, base_url: str):
         try:
-            r = requests.get(f"{base_url}/api/tags", timeout=5)
-            models = [m["name"] for m in r.json().get("models", [])]
-            if not any(model.split(":")[0] in m for m in models):
+            models = list(_list_ollama_models(base_url))
+            # compare the full tag so a missing quantization variant
+            # (e.g. qwen2.5:14b-instruct-q8_0) is reported, not masked
+            tag = model if ":" in model else f"{model}:latest"
+            if tag not in models:
                 print(f"  ⚠ '{model}' not found. Available: {models}")
                 print(f"    Run: ollama pull {model}")
         except requests.ConnectionError:
@@ -29,108 +135,195 @@ class ESGExtractorOllama:
         Prompt design for ESG extraction
         In Korean to match the report language, with clear instructions and format.
         """
-        metrics_list = "\n".join(
-            f"  - {m['id']}: {m['name_kr']} ({m['name_en']}) | "
-            f"Unit: {m['unit']} | GRI: {m['gri']}"
-            for m in ESG_METRICS
-        )
-        return f"""당신은 한국 기업 ESG 공시 보고서 데이터 추출 전문가입니다.
-
-아래는 지속가능경영보고서 {page_num}페이지 텍스트입니다.
-다음 지표의 값을 찾아 JSON으로 반환하세요.
-
-[대상 지표]
-{metrics_list}
-
-[규칙]
-1. 해당 지표가 텍스트에 없으면 건너뛰세요.
-2. 숫자의 쉼표를 제거하고 순수 숫자만 반환하세요.
-3. 반드시 아래 JSON 형식으로만 응답하세요. 다른 텍스트는 절대 포함하지 마세요.
-
-[형식]
-{{"extracted": [
-  {{"metric_id": "E01", "value": 12345.6, "unit": "tCO2eq",
-    "year": 2023, "confidence": <당신이 생각하는 0~1 사이의 신뢰도 점수>,
-    "source_text": "원문에서 발췌한 근거 문장"}}
-]}}
+        return page_prompt(_PROMPT_PREFIX, text, page_num)
 
-어떤 지표도 없으면 {{"extracted": []}}
-
-[텍스트]
-{text[:3000]}"""
+    def _build_batch_prompt(self, pages: List[Dict], snippets: List[str]) -> str:
+        """Prompt covering several pages, marked [PAGE 0] … [PAGE B-1]"""
+        blocks = "\n".join(
+            f"[PAGE {k}] ({page['page_num']}페이지)\n{snippet}\n"
+            for k, (page, snippet) in enumerate(zip(pages, snippets))
+        )
+        return f"{_BATCH_PROMPT_PREFIX}\n\n{blocks}"
 
-    def _call_ollama(self, prompt: str) -> str:
-        """Call Ollama API with the prompt and return raw text response"""
-        resp = requests.post(
+    def _call_ollama(self, prompt: str, n_pages: int = 1) -> str:
+        """
+        POST /api/generate and return the raw text response.
+        The reply is streamed: with format=json it is a single object, and
+        once it is complete the answer is known. The `done` chunk normally
+        follows within a few (whitespace) tokens, so up to TRAILING_CHUNKS
+        more are read: a fully read body returns the connection to the
+        session pool. A model that keeps padding past that is cut off by
+        closing the response, which costs that connection but stops the
+        generation on the server. A reply cut off by num_predict before the
+        object closed raises, so extract() reports the page instead of
+        silently finding nothing on it.
+        """
+        parts: List[str] = []
+        complete: Optional[str] = None  # response text once the object closed
+        trailing = 0
+        with self.session.post(
             f"{self.base_url}/api/generate",
             json={
                 "model": self.model,
                 "prompt": prompt,
-                "stream": False,
+                "stream": True,
+                # constrain decoding to JSON; generation ends at the closing brace
+                "format": "json",
                 "options": {
                     "temperature": 0.0,
-                    "num_predict": 2048,
+                    "num_predict": self.max_new * n_pages,
+                    **({"num_ctx": self.num_ctx} if self.num_ctx else {}),
                 }
             },
             timeout=120,
-        )
-        resp.raise_for_status()
-        return resp.json()["response"]
+            stream=True,
+        ) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                chunk = loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(chunk["error"])
+                if chunk.get("done"):
+                    if complete is None and chunk.get("done_reason") == "length":
+                        raise RuntimeError(
+                            f"reply truncated at num_predict="
+                            f"{self.max_new * n_pages} tokens")
+                    # keep iterating: the body ends right after `done`, and
+                    # reading it to the end lets the connection be reused
+                    parts.append(chunk.get("response", ""))
+                    continue
+                if complete is not None:
+                    trailing += 1
+                    if trailing > self.TRAILING_CHUNKS:
+                        return complete
+                    continue
+                parts.append(chunk.get("response", ""))
+                # only a closing brace can complete the object
+                if "}" in parts[-1]:
+                    text = "".join(parts).lstrip()
+                    try:
+                        _JSON_DECODER.raw_decode(text)
+                        complete = text
+                    except ValueError:
+                        pass
+        return complete if complete is not None else "".join(parts)
 
-    def _parse_json(self, text: str) -> Dict:
+    def _parse_json(self, text: str, key: str = "extracted") -> Dict:
         """
         Extract JSON object from the model's response text
-        Robust parsing to handle potential formatting issues from the LLM output.
+        Robust parsing to handle potential formatting issues from the LLM output:
+        a single forward scan that tries raw_decode at each '{', which covers
+        bare JSON, ```json fences and surrounding prose without regex
+        backtracking over the whole response. With format=json the reply is
+        normally bare JSON, so one full parse is tried first. Only an object
+        holding the top-level `key` is accepted, so a partial reply never
+        yields one of its inner item dicts.
         """
-
-        # 1: Parse entire text as JSON (if model followed instructions perfectly)
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            obj = loads(text)
+            if isinstance(obj, dict) and key in obj:
+                return obj
+        except ValueError:
             pass
 
-        # 2: Extract JSON from code block (if model wrapped it in ```json ... ```)
-        import re
-        match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
-        if match:
+        i = text.find("{")
+        while i != -1:
             try:
-                return json.loads(match.group(1))
+                obj, _ = _JSON_DECODER.raw_decode(text, i)
+                if isinstance(obj, dict) and key in obj:
+                    return obj
             except json.JSONDecodeError:
                 pass
+            i = text.find("{", i + 1)
 
-        # 3: Extract first JSON-like substring (fallback)
-        match = re.search(r'\{.*\}', text, re.DOTALL)
-        if match:
-            try:
-                return json.loads(match.group(0))
-            except json.JSONDecodeError:
-                pass
+        return {key: []}
 
-        return {"extracted": []}
+    def _process_page(self, page: Dict, snippet: str) -> List[Dict]:
+        """Prompt → LLM call → parse for a single page"""
+        prompt = self._build_prompt(snippet, page["page_num"])
+        raw = self._call_ollama(prompt)
+        result = self._parse_json(raw)
 
-    def extract(self, pages: List[Dict]) -> List[Dict]:
-        all_items = []
-        total = len(pages)
+        items = result.get("extracted", [])
+        for item in items:
+            item["page_num"] = page["page_num"]
+        return items
 
-        for i, page in enumerate(pages):
-            print(f"    Processing page {page['page_num']} "
-                  f"({i+1}/{total})…", end="", flush=True)
-            try:
-                prompt = self._build_prompt(
-                    page["combined"], page["page_num"]
-                )
-                raw = self._call_ollama(prompt)
-                result = self._parse_json(raw)
+    def _process_batch(self, pages: List[Dict],
+                       snippets: List[str]) -> List[List[Dict]]:
+        """One LLM call for a group of pages; returns items per page"""
+        if len(pages) == 1:
+            return [self._process_page(pages[0], snippets[0])]
 
-                items = result.get("extracted", [])
-                for item in items:
-                    item["page_num"] = page["page_num"]
-                    all_items.append(item)
+        raw = self._call_ollama(self._build_batch_prompt(pages, snippets),
+                                len(pages))
+        result = self._parse_json(raw, "batched")
 
-                print(f" → {len(items)} metrics found")
+        per_page: List[List[Dict]] = [[] for _ in pages]
+        for block in result.get("batched", []):
+            k = block.get("page_index")
+            if not isinstance(k, int) or not 0 <= k < len(pages):
+                continue
+            for item in block.get("extracted", []):
+                item["page_num"] = pages[k]["page_num"]
+                per_page[k].append(item)
+        return per_page
 
-            except Exception as e:
-                print(f" ⚠ Error: {e}")
+    def extract(self, pages: List[Dict]) -> List[Dict]:
+        """
+        Pages are independent and each call mostly waits on the Ollama
+        server, so several requests (of batch_size pages each) are kept in
+        flight with a thread pool. Pages whose text is identical (covers,
+        dividers, image-only pages) are sent once and their items copied
+        to every page sharing that text. Pages too short or without any
+        digit are never sent.
+        """
+        pages = candidate_pages(pages)
 
+        # the only truncation: dedup keys and prompts both use this
+        snippets = [p["combined"][:self.MAX_PAGE_CHARS] for p in pages]
+        keys = [hashlib.blake2b(snippet.encode(), digest_size=16).digest()
+                for snippet in snippets]
+        first: Dict[bytes, int] = {}
+        for i, key in enumerate(keys):
+            first.setdefault(key, i)
+        unique = list(first.values())
+        if len(unique) < len(pages):
+            print(f"    {len(pages) - len(unique)} duplicate pages reuse another page's result")
+
+        B = self.batch_size
+        batch_idx = [unique[i:i + B] for i in range(0, len(unique), B)]
+        batches = [[pages[j] for j in idx] for idx in batch_idx]
+        total = len(batches)
+        # filled by batch index, so output keeps input page order
+        results: List[List[List[Dict]]] = [[[] for _ in batch] for batch in batches]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+            futures = {ex.submit(self._process_batch, batches[i],
+                                 [snippets[j] for j in idx]): i
+                       for i, idx in enumerate(batch_idx)}
+            for done, fut in enumerate(as_completed(futures), 1):
+                i = futures[fut]
+                nums = [p["page_num"] for p in batches[i]]
+                # deduplicated pages need not be consecutive, so list them
+                label = (f"Page {nums[0]}" if len(nums) == 1
+                         else "Pages " + ", ".join(map(str, nums)))
+                try:
+                    results[i] = fut.result()
+                    n = sum(len(items) for items in results[i])
+                    print(f"    {label} ({done}/{total}) → {n} metrics found")
+                except Exception as e:
+                    print(f"    {label} ({done}/{total}) ⚠ Error: {e}")
+
+        # fan results back out to every page, in page order
+        by_key = dict(zip(first, (items for per_page in results for items in per_page)))
+        all_items = []
+        for i, (page, key) in enumerate(zip(pages, keys)):
+            items = by_key[key]
+            if first[key] != i:
+                items = [{**item, "page_num": page["page_num"]} for item in items]
+            all_items.extend(items)
         print(f"  ✓ Extracted {len(all_items)} metric values total")
-        return all_items
\ No newline at end of file
+        return all_items
@@ -4,37 +4,18 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
-from esg_standards import ESG_METRICS
-import json
-from typing import List, Dict
+from .common import METRICS_BLOCK, candidate_pages, loads, page_prompt
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
 
+# Sent as the user message, with the page appended by page_prompt
+_PROMPT_PREFIX = """당신은 한국 기업 ESG 공시 보고서 데이터 추출 전문가입니다.
 
-
-class ESGExtractor:
-    """
-    OpenAI-based extractor for ESG data from Korean reports.
-    Uses GPT-4o for better Korean understanding and structured output.
-    """
-
-    def __init__(self, api_key: str, model: str = "gpt-4o"):
-        if not OPENAI_AVAILABLE:
-            raise ImportError("pip install openai 필요")
-        self.client = OpenAI(api_key=api_key)
-        self.model = model
-
-    def _build_prompt(self, text: str, page_num: int) -> str:
-        metrics_list = "\n".join(
-            f"  - {m['id']}: {m['name_kr']} ({m['name_en']}) | "
-            f"Unit: {m['unit']} | GRI: {m['gri']}"
-            for m in ESG_METRICS
-        )
-        return f"""당신은 한국 기업 ESG 공시 보고서 데이터 추출 전문가입니다.
-
-아래는 지속가능경영보고서 {page_num}페이지 텍스트입니다.
+아래 [텍스트]는 지속가능경영보고서의 한 페이지입니다.
 다음 지표의 값을 찾아 JSON으로 반환하세요.
 
 [대상 지표]
-{metrics_list}
+{metrics}
 
 [규칙]
 1. 해당 지표가 텍스트에 없으면 건너뛰세요.
@@ -48,32 +29,66 @@ class ESGExtractor:
     "source_text": "원문에서 발췌한 근거 문장"}}
 ]}}
 
-어떤 지표도 없으면 {{"extracted": []}}
+어떤 지표도 없으면 {{"extracted": []}}""".format(metrics=METRICS_BLOCK)
+
 
-[텍스트]
-{text[:4000]}"""
+class ESGExtractor:
+    """
+    OpenAI-based extractor for ESG data from Korean reports.
+    Uses GPT-4o for better Korean understanding and structured output.
+    """
+
+    MAX_PAGE_CHARS = 4000  # page text sent to the model per prompt
+
+    MAX_WORKERS = 16  # default requests in flight; stays inside tier rate limits
+
+    def __init__(self, api_key: str, model: str = "gpt-4o",
+                 max_workers: Optional[int] = None):
+        if not OPENAI_AVAILABLE:
+            raise ImportError("pip install openai 필요")
+        # one client shared by the worker threads (it is thread-safe)
+        self.client = OpenAI(api_key=api_key)
+        self.model = model
+        self.max_workers = max(1, max_workers or self.MAX_WORKERS)
+
+    def _build_prompt(self, text: str, page_num: int) -> str:
+        return page_prompt(_PROMPT_PREFIX, text, page_num)
+
+    def _process_page(self, page: Dict) -> List[Dict]:
+        """Prompt → API call → parse for a single page"""
+        resp = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system",
+                 "content": "ESG data extraction specialist. Respond with valid JSON only."},
+                {"role": "user",
+                 "content": self._build_prompt(
+                     page["combined"][:self.MAX_PAGE_CHARS], page["page_num"])}
+            ],
+            temperature=0.0,
+            response_format={"type": "json_object"},
+        )
+        result = loads(resp.choices[0].message.content)
+        items = result.get("extracted", [])
+        for item in items:
+            item["page_num"] = page["page_num"]
+        return items
 
     def extract(self, pages: List[Dict]) -> List[Dict]:
-        all_items = []
-        for page in pages:
-            try:
-                resp = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system",
-                         "content": "ESG data extraction specialist. Respond with valid JSON only."},
-                        {"role": "user",
-                         "content": self._build_prompt(page["combined"], page["page_num"])}
-                    ],
-                    temperature=0.0,
-                    response_format={"type": "json_object"},
-                )
-                result = json.loads(resp.choices[0].message.content)
-                for item in result.get("extracted", []):
-                    item["page_num"] = page["page_num"]
-                    all_items.append(item)
-            except Exception as e:
-                print(f"    ⚠ Page {page['page_num']}: {e}")
+        """
+        Each page is one blocking API round trip, so up to max_workers
+        requests are kept in flight with a thread pool instead of
+        running them back to back.
+        """
+        pages = candidate_pages(pages)
+        # results are collected in submission order, so output keeps page order
+        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+            futures = [ex.submit(self._process_page, page) for page in pages]
+            all_items = []
+            for page, fut in zip(pages, futures):
+                try:
+                    all_items.extend(fut.result())
+                except Exception as e:
+                    print(f"    ⚠ Page {page['page_num']}: {e}")
         print(f"  ✓ Extracted {len(all_items)} metric values")
         return all_items
-    
\ No newline at end of file
@@ -1,6 +1,6 @@
 import numpy as np
 from typing import List, Dict
-from esg_standards import ESG_METRICS
+from esg_standards import METRICS_BY_ID
 
 # mock data generator for testing and demo purposes
 def generate_mock_data() -> List[Dict]:
@@ -26,7 +26,7 @@ def generate_mock_data() -> List[Dict]:
     }
     items = []
     for mid, (val, conf, src) in mock.items():
-        d = next(m for m in ESG_METRICS if m["id"] == mid)
+        d = METRICS_BY_ID[mid]
         items.append({
             "metric_id": mid, "value": val, "unit": d["unit"],
             "year": 2023, "page_num": np.random.randint(15, 85),
@@ -3,33 +3,76 @@ try:
     PDF_AVAILABLE = True
 except ImportError:
     PDF_AVAILABLE = False
-from typing import List, Dict, Optional
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Dict, Optional
 from tqdm import tqdm
 # ============================================================
 # 2. PDF PARSER
 # ============================================================
+def _combine_page(page) -> str:
+    """Page text followed by its tables as ' | '-joined rows"""
+    text = page.extract_text() or ""
+    table_text = "".join(
+        " | ".join(str(c) if c else "" for c in row) + "\n"
+        for table in (page.extract_tables() or [])
+        for row in table
+    )
+    return f"{text}\n\n[TABLE]\n{table_text}" if table_text else text
+
+
+# Worker-process state: each worker opens the PDF once, not once per page
+_worker_pdf = None
+
+
+def _open_worker_pdf(pdf_path: str):
+    global _worker_pdf
+    _worker_pdf = pdfplumber.open(pdf_path)
+
+
+def _parse_worker_page(index: int) -> Dict:
+    page = _worker_pdf.pages[index]
+    combined = _combine_page(page)
+    page.close()
+    return {"page_num": index + 1, "combined": combined}
+
+
 class PDFParser:
     """
     Parses Korean ESG PDFs into page-level text and table data.
     """
 
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: str, workers: Optional[int] = None):
         if not PDF_AVAILABLE:
             raise ImportError("pdfplumber not installed.")
         self.pdf_path = pdf_path
+        # pages are parsed in parallel processes; 1 parses in-process
+        self.workers = workers or os.cpu_count() or 1
 
-    def parse(self) -> List[Dict]:
-        pages = []
+    def iter_pages(self) -> Iterator[Dict]:
+        """
+        Yield pages in order; only `page_num` and `combined` (text plus
+        tables) are kept, since that is all the extractors consume.
+        Layout analysis is CPU-bound and pages are independent, so they are
+        spread over a process pool.
+        """
         with pdfplumber.open(self.pdf_path) as pdf:
-            for i, page in tqdm(enumerate(pdf.pages)):
-                text = page.extract_text() or ""
-                table_text = ""
-                for table in (page.extract_tables() or []):
-                    for row in table:
-                        cells = [str(c) if c else "" for c in row]
-                        table_text += " | ".join(cells) + "\n"
-                combined = f"{text}\n\n[TABLE]\n{table_text}" if table_text else text
-                pages.append({"page_num": i + 1, "text": text,
-                              "table_text": table_text, "combined": combined})
+            n_pages = len(pdf.pages)
+            if self.workers <= 1 or n_pages <= 1:
+                for i, page in tqdm(enumerate(pdf.pages), total=n_pages):
+                    combined = _combine_page(page)
+                    page.close()  # drop pdfplumber's cached layout objects
+                    yield {"page_num": i + 1, "combined": combined}
+                return
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, n_pages),
+                                 initializer=_open_worker_pdf,
+                                 initargs=(self.pdf_path,)) as ex:
+            yield from tqdm(ex.map(_parse_worker_page, range(n_pages),
+                                   chunksize=4),
+                            total=n_pages)
+
+    def parse(self) -> List[Dict]:
+        pages = list(self.iter_pages())
         print(f"  ✓ Parsed {len(pages)} pages")
         return pages
\ No newline at end of file
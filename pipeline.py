@@ -10,7 +10,6 @@ import argparse
 import os
 
 from dashboard import Dashboard
-from extractor.init_extractor import ESGExtractor, ESGExtractorOllama
 from parser import PDFParser
 from qualityassessor import QualityAssessor
 from validator import Validator
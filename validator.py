@@ -1,30 +1,50 @@
-from esg_standards import ESG_METRICS
+from esg_standards import METRICS_BY_ID
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Optional
 
+_CHECKS = ("is_numeric", "in_range", "unit_match", "has_year", "has_source")
+# bit of each check in the `checks_mask` column,
+# e.g. df[df.checks_mask & CHECK_BITS["unit_match"] == 0]
+CHECK_BITS = {k: 1 << i for i, k in enumerate(_CHECKS)}
+
+
+def _strip(v) -> Optional[str]:
+    """v.strip() for strings, None for anything else (None, numbers, lists)"""
+    return v.strip() if isinstance(v, str) else None
+
+
 class Validator:
     """
     validate with business rules and ESG standards
     numeric, range, unit, year, source
     """
 
-    def __init__(self):
-        self.defs = {m["id"]: m for m in ESG_METRICS}
+    def __init__(self, verbose: bool = True):
+        # progress line (and the score mean it needs) only when verbose
+        self.verbose = verbose
+        # shared id → metric lookup, built once at import in esg_standards
+        self.defs = METRICS_BY_ID
 
     def validate(self, extracted: List[Dict]) -> pd.DataFrame:
+        if not extracted:
+            return pd.DataFrame()
+
         rows = []
         for item in extracted:
             mid = item.get("metric_id", "")
-            d = self.defs.get(mid, {})
+            d = self.defs.get(mid, {}) if isinstance(mid, str) else {}
             val = item.get("value")
+            unit = item.get("unit", "")
+            year = item.get("year")
+            source = item.get("source_text", "")
 
             checks = {
-                "is_numeric": isinstance(val, (int, float)) and val is not None,
+                "is_numeric": isinstance(val, (int, float)),
                 "in_range": False,
-                "unit_match": item.get("unit", "").strip() == d.get("unit", ""),
-                "has_year": isinstance(item.get("year"), int)
-                            and 2000 <= item.get("year", 0) <= 2026,
-                "has_source": bool(item.get("source_text", "").strip()),
+                "unit_match": _strip(unit) == d.get("unit", ""),
+                "has_year": type(year) is int and 2000 <= year <= 2026,
+                "has_source": bool(_strip(source)),
             }
             if checks["is_numeric"] and d.get("valid_range"):
                 lo, hi = d["valid_range"]
@@ -40,19 +60,22 @@ class Validator:
                 "name_kr": d.get("name_kr", ""),
                 "gri": d.get("gri", ""),
                 "value": val,
-                "unit": item.get("unit", ""),
-                "year": item.get("year"),
+                "unit": unit,
+                "year": year,
                 "page_num": item.get("page_num"),
                 "confidence": item.get("confidence", 0),
-                "source_text": item.get("source_text", ""),
+                "source_text": source,
                 "validation_score": passed / total,
                 "checks_passed": passed,
                 "checks_total": total,
                 **{f"chk_{k}": v for k, v in checks.items()},
+                "checks_mask": sum(CHECK_BITS[k] for k, v in checks.items() if v),
             })
 
-        df = pd.DataFrame(rows)
-        if len(df):
-            print(f"  ✓ Validated {len(df)} items — "
-                  f"avg score {df['validation_score'].mean():.0%}")
-        return df
\ No newline at end of file
+        out = pd.DataFrame(rows)
+        out["checks_mask"] = out["checks_mask"].astype(np.uint8)
+
+        if self.verbose:
+            print(f"  ✓ Validated {len(out)} items — "
+                  f"avg score {out['validation_score'].mean():.0%}")
+        return out